@@ -4,31 +4,215 @@ This module provides utilities for generating vector embeddings from text using
 Functions:
     generate_embedding(text: str):
         - Encodes the input text into a vector embedding using the 'all-MiniLM-L6-v2' model.
-        - Returns the embedding as a Python list of floats, suitable for use with Oracle VECTOR columns.
+        - Returns the embedding as a float32 array.array, bound directly by oracledb to Oracle VECTOR columns.
+        - Repeated texts (after whitespace normalization) are served from an in-process LRU cache.
+    generate_embeddings(texts: list[str], batch_size: int):
+        - Encodes many texts with one batched forward pass per batch_size texts.
+        - Returns one embedding per input text, in input order.
+
+Backends:
+- ONNX Runtime (int8, CPU): used when the quantized model produced by export_embedding_model.py is present
+  and EMBEDDING_DEVICE is "auto" or "cpu".
+- SentenceTransformer (PyTorch): otherwise; runs on CUDA (fp16), MPS, or CPU (fp32) per EMBEDDING_DEVICE,
+  where "auto" picks the best available device.
+- Either backend is loaded lazily on the first embedding request.
 
 Responsibilities:
 - Provide a simple interface for text-to-vector conversion.
 - Use a lightweight, widely adopted model for efficient embedding generation.
+- Avoid re-running the model forward pass for texts that were already embedded.
 
 Usage:
     Import and call generate_embedding(text) to obtain embeddings for natural language input in downstream agents or database operations.
 """
 
-from sentence_transformers import SentenceTransformer
+import os
+from array import array
+from functools import lru_cache
+
+import numpy as np
 from opentelemetry import trace
 
+from config.settings import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_DEVICE,
+    EMBEDDING_ONNX_DIR
+)
+
 tracer = trace.get_tracer("embedding-tool")
 
 # Lightweight, widely used, 384-dim
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+MODEL_NAME = "all-MiniLM-L6-v2"
+_MAX_SEQ_LENGTH = 256
+
+_ONNX_MODEL_PATH = os.path.join(EMBEDDING_ONNX_DIR, "model_quantized.onnx")
+
+# Models are loaded on first use, not at import, so importing the graph
+# (or a --help run) does not pay for loading weights.
+
+@lru_cache(maxsize=1)
+def _get_onnx():
+    """
+    Returns (session, input_names, tokenizer) for the int8 ONNX model, or
+    None when the exported model or onnxruntime is unavailable.
+    """
+    # The int8 model is a CPU backend; an explicit accelerator wins
+    if EMBEDDING_DEVICE not in ("auto", "cpu"):
+        return None
+
+    if not os.path.exists(_ONNX_MODEL_PATH):
+        return None
+
+    try:
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+    except ImportError:
+        return None
+
+    session = ort.InferenceSession(
+        _ONNX_MODEL_PATH, providers=["CPUExecutionProvider"]
+    )
+    input_names = {i.name for i in session.get_inputs()}
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_ONNX_DIR)
+    return session, input_names, tokenizer
+
+
+@lru_cache(maxsize=1)
+def _get_device():
+    if EMBEDDING_DEVICE != "auto":
+        return EMBEDDING_DEVICE
+
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+@lru_cache(maxsize=1)
+def _get_model():
+    from sentence_transformers import SentenceTransformer
+
+    device = _get_device()
+    model = SentenceTransformer(MODEL_NAME, device=device)
+
+    # fp16 halves weight bandwidth and uses tensor cores on CUDA
+    if device == "cuda":
+        model = model.half()
+    return model
+
+
+def _backend_name():
+    if _get_onnx() is not None:
+        return "onnx-int8"
+    return f"sentence-transformers:{_get_device()}"
+
+
+def _encode_batch(texts, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Encodes a list of texts into a (len(texts), 384) array of unit-length
+    vectors, so cosine distance in Oracle equals 1 - dot product.
+    """
+    onnx = _get_onnx()
+    if onnx is None:
+        return _get_model().encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+    session, input_names, tokenizer = onnx
+
+    # Sort by length so each batch pads to similar sizes
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    vectors = np.empty((len(texts), 384), dtype=np.float32)
+
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        tokens = tokenizer(
+            [texts[i] for i in chunk],
+            padding=True,
+            truncation=True,
+            max_length=_MAX_SEQ_LENGTH,
+            return_tensors="np",
+        )
+        feeds = {
+            name: value.astype(np.int64)
+            for name, value in tokens.items()
+            if name in input_names
+        }
+        token_embeddings = session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalization (same as the
+        # SentenceTransformer pipeline for this model)
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        vectors[chunk] = pooled
+
+    return vectors
+
+
+def _to_vector_bind(vector):
+    # Contiguous float32 buffer: oracledb binds it as VECTOR without
+    # converting 384 Python floats
+    return array("f", vector.astype(np.float32, copy=False).tobytes())
+
+
+def _normalize_text(text: str) -> str:
+    # Collapse whitespace so trivially different inputs share a cache entry
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=EMBEDDING_CACHE_SIZE)
+def _encode_cached(text_norm: str):
+    vector = _encode_batch([text_norm])[0]
+    # Cached arrays are shared between callers
+    vector.setflags(write=False)
+    return vector
+
 
 def generate_embedding(text: str):
     """
-    Returns a Python list of floats suitable for Oracle VECTOR.
+    Returns a float32 array.array suitable for Oracle VECTOR binds.
     """
     with tracer.start_as_current_span("embedding_generation") as span:
-        span.set_attribute("embedding.model", "all-MiniLM-L6-v2")
+        span.set_attribute("embedding.model", MODEL_NAME)
+        span.set_attribute("embedding.backend", _backend_name())
         span.set_attribute("embedding.input_length", len(text))
 
-        vector = _model.encode(text)
-        return vector.tolist()
+        hits_before = _encode_cached.cache_info().hits
+        vector = _encode_cached(_normalize_text(text))
+        span.set_attribute(
+            "embedding.cache_hit",
+            _encode_cached.cache_info().hits > hits_before
+        )
+
+        return _to_vector_bind(vector)
+
+
+def generate_embeddings(texts, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Returns one float32 array.array per input text, encoded in batches.
+    Duplicate texts are encoded once.
+    """
+    with tracer.start_as_current_span("embedding_generation_batch") as span:
+        normalized = [_normalize_text(t) for t in texts]
+        unique = list(dict.fromkeys(normalized))
+
+        span.set_attribute("embedding.model", MODEL_NAME)
+        span.set_attribute("embedding.backend", _backend_name())
+        span.set_attribute("embedding.batch_size", len(texts))
+        span.set_attribute("embedding.unique_texts", len(unique))
+
+        if not unique:
+            return []
+
+        vectors = _encode_batch(unique, batch_size=batch_size)
+        by_text = {t: _to_vector_bind(v) for t, v in zip(unique, vectors)}
+
+        return [by_text[t] for t in normalized]
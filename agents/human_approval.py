@@ -2,47 +2,177 @@
 This module implements the Human Approval Agent, which handles cases requiring manual review and approval in the incident decision workflow.
 
 Functions:
-    human_approval(state):
+    human_approval(state) (async):
         - Notifies the user that human review is required.
         - Displays the issue description, confidence score, and any suggested action based on historical evidence.
-        - Prompts the human reviewer to approve or reject the proposed action.
+        - Displays the knowledge agent's likely cause and typical fix as advisory context, when available.
+        - Prompts the human reviewer to approve or reject the proposed action without blocking the event loop.
+        - Treats no answer within HUMAN_APPROVAL_TIMEOUT_SECONDS as a rejection.
         - Updates the state with the final decision and a customer-facing response message.
 
 Responsibilities:
 - Ensure human-in-the-loop governance for low-confidence or exceptional cases.
-- Provide safe and clear evidence display for reviewers.
+- Provide safe and clear evidence display for reviewers (one buffered write, mirrored as span events).
 - Integrate with OpenTelemetry for observability.
 
 Usage:
     Used as a node in the decision graph when automated resolution is not possible or requires human oversight.
 """
 
+import asyncio
+import os
+import sys
+import threading
+
 from opentelemetry import trace
+
+from config.settings import HUMAN_APPROVAL_TIMEOUT_SECONDS
+
 tracer = trace.get_tracer("human-approval")
 
 
-def human_approval(state):
-    with tracer.start_as_current_span("human_gate"):
+# At most one stdin reader thread exists; each line goes to the prompt
+# currently waiting for it
+_reader_lock = threading.Lock()
+_waiter = None      # (loop, future) of the waiting prompt
+_reading = False    # a reader thread is blocked on stdin
 
-        print("\n⚠️  HUMAN REVIEW REQUIRED ⚠️")
-        print("--------------------------------")
 
-        print(f"Issue Description : {state['user_description']}")
-        print(f"Confidence Score  : {state['confidence']}")
+def _read_line():
+    if sys.stdin.isatty():
+        # Terminal: the raw fd, so a reader left waiting after a timeout does
+        # not hold the stdin buffer lock at exit. Terminal reads return one
+        # line at a time, so input() has nothing extra buffered.
+        try:
+            data = os.read(sys.stdin.fileno(), 4096)
+        except OSError:
+            data = b""
+        return data.decode(errors="replace").splitlines()[0] if data else ""
+
+    # Piped/redirected: the same buffered sys.stdin main.py's input() used,
+    # which may already hold the reviewer's answer
+    return sys.stdin.readline().rstrip("\n")
+
+
+def _reader():
+    global _waiter, _reading
+
+    value = _read_line()
+
+    with _reader_lock:
+        _reading = False
+        waiter, _waiter = _waiter, None
+
+    # No waiter: the prompt timed out and the late line is discarded
+    if waiter is not None:
+        loop, answer = waiter
+        try:
+            loop.call_soon_threadsafe(_deliver, answer, value)
+        except RuntimeError:
+            pass  # loop already closed
+
+
+def _deliver(answer, value):
+    if not answer.done():
+        answer.set_result(value)
+
+
+async def _ask(prompt):
+    """
+    Reads one line from stdin without blocking the event loop.
+
+    A reader still blocked from a timed-out prompt is reused, so the next
+    answer reaches the prompt that is actually waiting.
+    """
+    global _waiter, _reading
+
+    loop = asyncio.get_running_loop()
+    answer = loop.create_future()
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+
+    with _reader_lock:
+        _waiter = (loop, answer)
+        start = not _reading
+        _reading = True
+
+    if start:
+        threading.Thread(target=_reader, daemon=True).start()
+
+    try:
+        return await answer
+    finally:
+        with _reader_lock:
+            if _waiter is not None and _waiter[1] is answer:
+                _waiter = None
+
+
+async def human_approval(state):
+    with tracer.start_as_current_span("human_gate") as span:
+        # Set on every human-reviewed trace, whichever orchestrator branch
+        # routed it here; tail sampling keeps traces carrying it
+        span.set_attribute("human.review", True)
 
-        # ---- Safe evidence display ----
         evidence = state.get("oracle_evidence")
+        knowledge = state.get("knowledge_signal")
 
+        lines = [
+            "",
+            "⚠️  HUMAN REVIEW REQUIRED ⚠️",
+            "--------------------------------",
+            f"Issue Description : {state['user_description']}",
+            f"Confidence Score  : {state['confidence']}",
+            "",
+            "Suggested Action:",
+        ]
+
+        # ---- Safe evidence display ----
         if evidence and evidence.get("common_resolution"):
-            print("\nSuggested Action:")
-            print(f"  - {evidence['common_resolution']}")
+            lines.append(f"  - {evidence['common_resolution']}")
         else:
-            print("\nSuggested Action:")
-            print("  - No reliable historical action available")
+            lines.append("  - No reliable historical action available")
+
+        # ---- Contextual knowledge (advisory only) ----
+        has_knowledge = bool(
+            knowledge and (knowledge.get("known_cause") or knowledge.get("suggested_fix"))
+        )
+        if has_knowledge:
+            lines += [
+                "",
+                "Context (AI-generated, not verified):",
+                f"  - Likely cause : {knowledge.get('known_cause') or 'n/a'}",
+                f"  - Typical fix  : {knowledge.get('suggested_fix') or 'n/a'}",
+            ]
+
+        lines.append("--------------------------------")
 
-        print("--------------------------------")
+        # One buffered write instead of a print per line
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+        span.add_event(
+            "awaiting_human_decision",
+            {
+                "confidence": float(state["confidence"] or 0.0),
+                "has_evidence": bool(evidence),
+                "has_knowledge": has_knowledge,
+            },
+        )
+
+        try:
+            decision = await asyncio.wait_for(
+                _ask("Proceed with action? (yes/no): "),
+                timeout=HUMAN_APPROVAL_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            # No answer in time → treat as rejection (safe default)
+            sys.stdout.write("\nNo decision received in time; escalating.\n")
+            span.set_attribute("human.timed_out", True)
+            decision = ""
 
-        decision = input("Proceed with action? (yes/no): ").strip().lower()
+        decision = decision.strip().lower()
+        span.add_event("human_decision_received", {"decision": decision or "none"})
 
         if decision == "yes":
             state["final_decision"] = "HUMAN_APPROVED"
@@ -2,10 +2,12 @@
 This module implements the Knowledge Agent, which enriches the incident state with contextual knowledge using a generative AI model (Gemini).
 
 Functions:
-    knowledge_agent(state):
-        - Uses the incident signature (type, affected area, context) to construct a prompt.
-        - Invokes the Gemini generative AI model to retrieve common causes and typical fixes for the incident.
-        - Updates the state with the knowledge signal, including known cause, suggested fix, and a confidence hint.
+    knowledge_agent(state) (async):
+        - Reuses the knowledge of an identical earlier request (request memo) when available.
+        - Fills the incident signature (type, affected area, context) into a precompiled prompt template.
+        - Invokes the Gemini generative AI model to retrieve the common cause and typical fix for the incident as JSON.
+        - Parses the response once into separate fields, with a heuristic split for non-JSON answers.
+        - Returns the knowledge signal (known cause, suggested fix, and a confidence hint) as a partial state update.
 
 Responsibilities:
 - Provide contextual knowledge for incident analysis.
@@ -13,58 +15,102 @@ Responsibilities:
 - Ensure observability with OpenTelemetry tracing.
 
 Usage:
-    Used as a node in the decision graph to supplement evidence with AI-driven knowledge for downstream decision-making.
+    Used as a node in the decision graph, on the human review path only, to give the reviewer AI-driven context alongside the evidence.
 """
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 from opentelemetry import trace
 
+from agents.llm_utils import parse_json_object, response_text as llm_response_text
+from agents.request_memo import recall, remember
 from state import state
 tracer = trace.get_tracer("knowledge-agent")
 from config.settings import  GEMINI_KEY
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-flash-latest",
-    google_api_key=GEMINI_KEY,
-    temperature=0
-)
+@lru_cache(maxsize=1)
+def _get_llm():
+    # Built on first use: the client (and its import) is skipped entirely
+    # for incidents that never reach human review
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model="gemini-flash-latest",
+        google_api_key=GEMINI_KEY,
+        temperature=0
+    )
+
+# Static instructions built once; only the incident signature varies per call
+_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content="""
+You are providing contextual knowledge only.
+
+Return ONLY valid JSON in this format:
+
+{
+  "common_cause": "<most common cause of this incident>",
+  "typical_fix": "<typical fix for this incident>"
+}
+"""),
+    HumanMessagePromptTemplate.from_template(
+        "Incident type: {incident_type}\n"
+        "Affected area: {affected_area}\n"
+        "Context: {context}"
+    ),
+])
+
+
+def _split_unstructured(text):
+    # Fallback for non-JSON answers: text before "typical_fix" is the cause
+    cause, _, fix = text.partition("typical_fix")
+    return {
+        "common_cause": cause.replace("common_cause", "").strip(" \n:-*"),
+        "typical_fix": fix.strip(" \n:-*"),
+    }
+
+
+async def knowledge_agent(state):
+ with tracer.start_as_current_span("context_lookup") as span:
+    # Repeated request → reuse prior knowledge
+    memo = recall(state.get("request_key"), "knowledge")
+    span.set_attribute("memo.hit", memo is not None)
+    if memo:
+        return memo
 
-def knowledge_agent(state):
- with tracer.start_as_current_span("context_lookup"):
     signature = state["incident_signature"]
 
     incident_type = signature.get("incident_type")
     affected_area = signature.get("affected_area")
     context = signature.get("context")
 
-    prompt = f"""
-You are providing contextual knowledge only.
-
-Incident type: {incident_type}
-Affected area: {affected_area}
-Context: {context}
-
-Return:
-- common_cause
-- typical_fix
-"""
-
     with tracer.start_as_current_span("llm_call") as span:
         span.set_attribute("llm.provider", "gemini")
         span.set_attribute("llm.model", "gemini-flash-latest")
 
-        result = llm.invoke(prompt)
-
-    # Handle Gemini response shape
-        if isinstance(result.content, list):
-            response_text = result.content[0].get("text", "")
-        else:
-            response_text = result.content
-
-        state["knowledge_signal"] = {
-            "known_cause": response_text,
-            "suggested_fix": response_text,
-            "confidence_hint": 0.5  # bounded, never dominant
+        # Non-blocking LLM call
+        result = await _get_llm().ainvoke(
+            _PROMPT.format_messages(
+                incident_type=incident_type,
+                affected_area=affected_area,
+                context=context
+            )
+        )
+
+        response_text = llm_response_text(result).strip()
+
+        parsed = parse_json_object(response_text)
+        if parsed is None:
+            parsed = _split_unstructured(response_text)
+
+        # Partial update: only the owned key
+        update = {
+            "knowledge_signal": {
+                "known_cause": str(parsed.get("common_cause") or ""),
+                "suggested_fix": str(parsed.get("typical_fix") or ""),
+                "confidence_hint": 0.5  # bounded, never dominant
             }
-
-        return state
\ No newline at end of file
+        }
+        remember(state.get("request_key"), "knowledge", update)
+        return update
\ No newline at end of file
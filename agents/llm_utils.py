@@ -0,0 +1,40 @@
+"""
+This module provides helpers for handling Gemini responses returned through the LangChain interface.
+
+Functions:
+    response_text(result):
+        - Extracts the text of a chat model response, whether Gemini returned a string or a list of content parts.
+    parse_json_object(text: str):
+        - Parses the outermost JSON object in the text with orjson, ignoring surrounding prose or markdown fences.
+        - Returns a dict, or None if no valid JSON object is present.
+
+Responsibilities:
+- Keep response-shape handling in one place for all LLM-backed agents.
+- Salvage JSON from near-miss responses instead of falling back immediately.
+
+Usage:
+    Import and call these helpers from agents after llm.ainvoke(...).
+"""
+
+import orjson
+
+
+def response_text(result):
+    # Gemini may return list or string
+    if isinstance(result.content, list):
+        return result.content[0].get("text", "")
+    return result.content
+
+
+def parse_json_object(text: str):
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        return None
+
+    try:
+        parsed = orjson.loads(text[start:end + 1])
+    except orjson.JSONDecodeError:
+        return None
+
+    return parsed if isinstance(parsed, dict) else None
@@ -3,15 +3,17 @@ This module implements the Oracle Evidence Agent, responsible for retrieving evi
 
 Functions:
     oracle_evidence_agent(state):
+        - Reuses the evidence of an identical earlier request (request memo) when available.
         - Generates an embedding for the user's issue description.
-        - Connects to the Oracle database and performs a VECTOR similarity search against historical incident playbooks.
-        - Aggregates evidence such as incident count, success rate, common resolution, and similarity score.
+        - Acquires a pooled Oracle connection and performs a VECTOR similarity search against historical incident playbooks.
+        - Fetches the EVIDENCE_TOP_K approximate nearest playbooks via the Oracle vector index.
+        - Aggregates evidence over candidates within MAX_VECTOR_DISTANCE: incident count, success rate, common resolution, and similarity score.
         - Handles errors gracefully, ensuring the decision graph does not crash.
-        - Updates the state with evidence and status, but does not make decisions.
+        - Returns evidence and status as a partial state update, but does not make decisions.
 
 Responsibilities:
 - Embedding generation for customer issues.
-- Oracle VECTOR similarity search for relevant playbooks.
+- Oracle approximate VECTOR similarity search for relevant playbooks.
 - Evidence aggregation for downstream decision-making.
 - Safe error handling and status reporting.
 
@@ -19,15 +21,45 @@ Usage:
     Used as a node in the decision graph to enrich the state with Oracle-derived evidence for incident analysis.
 """
 
+from functools import lru_cache
+
 import oracledb
 from opentelemetry import trace
 
 from agents.embedding_utils import generate_embedding
-from config.settings import MAX_VECTOR_DISTANCE,DB_HOST,DB_PASSWORD
+from agents.request_memo import recall, remember
+from config.settings import (
+    MAX_VECTOR_DISTANCE,
+    EVIDENCE_TOP_K,
+    DB_HOST,
+    DB_PASSWORD,
+    DB_POOL_MIN,
+    DB_POOL_MAX,
+    DB_POOL_INCREMENT,
+    DB_STMT_CACHE_SIZE
+)
 
 tracer = trace.get_tracer("oracle-evidence-agent")
 
 
+@lru_cache(maxsize=1)
+def _get_pool():
+    # Created on first use so an unreachable DB surfaces as evidence ERROR,
+    # not as an import failure of the whole graph
+    return oracledb.create_pool(
+        user="system",
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        port=1521,
+        service_name="FREEPDB1",
+        min=DB_POOL_MIN,
+        max=DB_POOL_MAX,
+        increment=DB_POOL_INCREMENT,
+        getmode=oracledb.POOL_GETMODE_WAIT,
+        stmtcachesize=DB_STMT_CACHE_SIZE
+    )
+
+
 def oracle_evidence_agent(state):
     """
     Oracle Evidence Agent
@@ -38,6 +70,9 @@ def oracle_evidence_agent(state):
     - Aggregate success/failure evidence
     - Fail safely on errors (never crash the graph)
 
+    Returns only the keys it owns (oracle_evidence, evidence_status) as a
+    partial state update.
+
     This agent NEVER decides.
     """
 
@@ -48,104 +83,114 @@ def oracle_evidence_agent(state):
             # ----------------------------
             issue_text = state.get("user_description")
             if not issue_text:
-                state["oracle_evidence"] = None
-                state["evidence_status"] = "NOT_FOUND"
-                return state
+                return {"oracle_evidence": None, "evidence_status": "NOT_FOUND"}
 
             # ----------------------------
-            # Generate embedding (Python-side)
+            # Repeated request → reuse prior evidence
             # ----------------------------
-            query_vector = generate_embedding(issue_text)
+            memo = recall(state.get("request_key"), "oracle_evidence")
+            span.set_attribute("memo.hit", memo is not None)
+            if memo:
+                return memo
 
             # ----------------------------
-            # Oracle connection
+            # Generate embedding (Python-side)
             # ----------------------------
-            conn = oracledb.connect(
-                user="system",
-                password=DB_PASSWORD,
-                host=DB_HOST,
-                port=1521,
-                service_name="FREEPDB1"
-            )
-
-            cursor = conn.cursor()
-
-            # Explicit VECTOR binding (critical)
-            cursor.setinputsizes(query_vec=oracledb.DB_TYPE_VECTOR)
+            query_vector = generate_embedding(issue_text)
 
             # ----------------------------
-            # Vector similarity search
-            # Deterministic ordering ensured
-            # ----------------------------
-            cursor.execute(
-                """
-                SELECT
-                    COUNT(*) AS total_matches,
-                    AVG(success) AS success_ratio,
-                    MAX(action_taken) KEEP (
-                        DENSE_RANK FIRST
-                        ORDER BY VECTOR_DISTANCE(embedding, :query_vec), id
-                    ) AS best_action,
-                    MIN(VECTOR_DISTANCE(embedding, :query_vec)) AS best_distance
-                FROM incident_playbooks
-                """,
-                query_vec=query_vector,
+            # Oracle connection (pooled)
+            # ----------------------------
+            with _get_pool().acquire() as conn, conn.cursor() as cursor:
+
+                # All top-k rows arrive with the execute round-trip
+                cursor.prefetchrows = EVIDENCE_TOP_K + 1
+                cursor.arraysize = EVIDENCE_TOP_K + 1
+
+                # Explicit VECTOR binding (critical)
+                cursor.setinputsizes(query_vec=oracledb.DB_TYPE_VECTOR)
+
+                # ----------------------------
+                # Approximate nearest-neighbor search
+                # Served by the vector index (see load_playbooks.py);
+                # the metric must match the index (COSINE).
+                # Only the top-k candidates leave the database.
+                # Rows without an embedding have a NULL distance and
+                # would take top-k slots; they are excluded up front.
+                # ----------------------------
+                cursor.execute(
+                    """
+                    SELECT
+                        id,
+                        action_taken,
+                        success,
+                        VECTOR_DISTANCE(embedding, :query_vec, COSINE) AS distance
+                    FROM incident_playbooks
+                    WHERE embedding IS NOT NULL
+                    ORDER BY VECTOR_DISTANCE(embedding, :query_vec, COSINE)
+                    FETCH APPROX FIRST :top_k ROWS ONLY
+                    """,
+                    query_vec=query_vector,
+                    top_k=EVIDENCE_TOP_K,
+                )
+
+                rows = cursor.fetchall()
+
+            # ----------------------------
+            # Aggregate candidates within the similarity threshold
+            # Deterministic ordering ensured (distance, id)
+            # ----------------------------
+            matches = sorted(
+                (row for row in rows if row[3] <= MAX_VECTOR_DISTANCE),
+                key=lambda row: (row[3], row[0])
             )
 
-            row = cursor.fetchone()
-
-            cursor.close()
-            conn.close()
-
             # ----------------------------
             # No evidence found
             # ----------------------------
-            if not row or row[0] == 0:
-                state["oracle_evidence"] = None
-                state["evidence_status"] = "NOT_FOUND"
-                return state
-
-            best_distance = float(row[3])
+            if not matches:
+                update = {"oracle_evidence": None, "evidence_status": "NOT_FOUND"}
+                remember(state.get("request_key"), "oracle_evidence", update)
+                return update
 
-            # Reject weak similarity matches
-            if best_distance > MAX_VECTOR_DISTANCE:
-                state["oracle_evidence"] = None
-                state["evidence_status"] = "NOT_FOUND"
-                return state
+            match_count = len(matches)
+            success_rate = sum(row[2] for row in matches) / match_count
+            best_action = matches[0][1]
+            best_distance = float(matches[0][3])
 
+            # Cosine distance on unit vectors: similarity = 1 - distance
             similarity_score = max(0.0, 1.0 - best_distance)
 
             # ----------------------------
             # Populate evidence
             # ----------------------------
-            state["oracle_evidence"] = {
-                "incident_count": int(row[0]),
-                "success_rate": float(row[1] or 0.0),
-                "common_resolution": row[2],
+            evidence = {
+                "incident_count": match_count,
+                "success_rate": float(success_rate),
+                "common_resolution": best_action,
                 "similarity_score": round(similarity_score, 2),
             }
 
-            state["evidence_status"] = "FOUND"
-
             # ----------------------------
             # Observability attributes
             # ----------------------------
             span.set_attribute("db.system", "oracle")
-            span.set_attribute("db.operation", "vector_similarity_search")
-            span.set_attribute("oracle.matches", row[0])
+            span.set_attribute("db.operation", "approximate_vector_search")
+            span.set_attribute("oracle.candidates", len(rows))
+            span.set_attribute("oracle.matches", match_count)
             span.set_attribute("oracle.similarity", similarity_score)
-            span.set_attribute("oracle.success_rate", row[1])
+            span.set_attribute("oracle.success_rate", success_rate)
 
-            return state
+            # Only definitive outcomes are memoized; ERROR is retried next time
+            update = {"oracle_evidence": evidence, "evidence_status": "FOUND"}
+            remember(state.get("request_key"), "oracle_evidence", update)
+            return update
 
         except Exception as e:
             # ----------------------------
             # HARD FAILURE → SAFE ESCALATION
             # ----------------------------
-            state["oracle_evidence"] = None
-            state["evidence_status"] = "ERROR"
-
             span.record_exception(e)
             span.set_status(trace.Status(trace.StatusCode.ERROR))
 
-            return state
+            return {"oracle_evidence": None, "evidence_status": "ERROR"}
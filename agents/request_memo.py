@@ -0,0 +1,60 @@
+"""
+This module provides an in-process memo that lets agents short-circuit repeated incident descriptions.
+
+Functions:
+    request_key(description: str):
+        - Returns a stable hash of the normalized (stripped, lower-cased) description, stored in state["request_key"].
+    recall(key, node):
+        - Returns a copy of the state update a node previously produced for this key, or None.
+    remember(key, node, update):
+        - Stores a node's state update for this key, evicting the least recently used request when full.
+
+Responsibilities:
+- Skip embedding, Oracle, and LLM work for descriptions already processed in this process.
+- Keep memory bounded (REQUEST_MEMO_SIZE requests) and safe across graph worker threads.
+
+Usage:
+    main.py computes request_key once per request; agents call recall() first and remember() on success.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+from config.settings import REQUEST_MEMO_SIZE
+
+_memo = OrderedDict()
+_lock = threading.Lock()
+
+
+def request_key(description: str) -> str:
+    normalized = (description or "").strip().lower()
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def recall(key, node):
+    if not key:
+        return None
+
+    with _lock:
+        entry = _memo.get(key)
+        if entry is None or node not in entry:
+            return None
+        _memo.move_to_end(key)
+        update = entry[node]
+
+    # Callers may mutate the returned state
+    return copy.deepcopy(update)
+
+
+def remember(key, node, update):
+    if not key:
+        return
+
+    with _lock:
+        _memo.setdefault(key, {})[node] = copy.deepcopy(update)
+        _memo.move_to_end(key)
+
+        while len(_memo) > REQUEST_MEMO_SIZE:
+            _memo.popitem(last=False)
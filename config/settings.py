@@ -6,22 +6,47 @@ This file contains policy values only—modifying these does not require code ch
 Sections:
 - Confidence & Decision Policy: Thresholds and weights for automated decision-making.
 - Database / Evidence Policy: Parameters for evidence evaluation and similarity checks.
-- Observability: Service name for tracing and monitoring.
+- Embeddings: Settings for local embedding generation.
+- LLM Response Cache: Persistent cache for Gemini completions.
+- Request Memo: In-process reuse of agent results for repeated descriptions.
+- Observability: Service name and span export tuning for tracing and monitoring.
 - Incident Normalization: Standardized incident types and affected areas for classification.
 
 Key Settings:
 - CONFIDENCE_THRESHOLD: Minimum confidence for autonomous actions.
 - SIMILARITY_WEIGHT, SUCCESS_WEIGHT: Weights for confidence calculation.
 - NO_EVIDENCE_CONFIDENCE, ERROR_CONFIDENCE: Fallback values for confidence.
+- HUMAN_APPROVAL_TIMEOUT_SECONDS: Wait for a human decision before escalating.
 - MAX_VECTOR_DISTANCE: Maximum allowed vector distance for similarity.
+- EVIDENCE_TOP_K: Number of nearest playbooks considered as evidence.
+- DB_POOL_MIN, DB_POOL_MAX, DB_POOL_INCREMENT: Oracle connection pool sizing.
+- DB_STMT_CACHE_SIZE: Statements cached per Oracle connection.
+- EMBEDDING_CACHE_SIZE: Number of embeddings cached in memory.
+- EMBEDDING_BATCH_SIZE: Texts per batched embedding forward pass.
+- EMBEDDING_DEVICE: Device for embedding inference (env-overridable).
+- EMBEDDING_ONNX_DIR: Location of the quantized ONNX embedding model.
+- LLM_CACHE_ENABLED, LLM_CACHE_PATH: Gemini response cache toggle and location.
+- REQUEST_MEMO_SIZE: Number of repeated requests memoized.
 - SERVICE_NAME: Identifier for observability/tracing.
-- INCIDENT_TYPES, AFFECTED_AREAS: Lists for incident classification.
+- SERVICE_VERSION, DEPLOYMENT_ENVIRONMENT: Resource attributes attached once to all spans.
+- TRACING_ENABLED, TRACE_SAMPLE_RATIO: Tracing switch and head-based sampling ratio.
+- OTEL_BSP_*: Span batching queue size, batch size, delay, and export timeout.
+- OTEL_EXPORT_WORKERS: Number of parallel span export workers (opt-in, default 1).
+- OTLP_COMPRESSION: Span export compression (gzip, deflate, none).
+- SPAN_MAX_ATTRIBUTES, SPAN_MAX_EVENTS, SPAN_ATTRIBUTE_MAX_LENGTH: Per-span size limits.
+- OTLP_ASYNC_EXPORT, OTLP_MAX_IN_FLIGHT: Opt-in pipelined (grpc.aio) span export.
+- TAIL_SAMPLING_*: Opt-in tail sampling (errors, slow spans, flagged attributes).
+- INCIDENT_TYPE_CHOICES, AFFECTED_AREA_CHOICES: Ordered incident types and areas (for prompts).
+- INCIDENT_TYPES, AFFECTED_AREAS: Frozensets of the same values (for validation).
+- INCIDENT_TYPE_KEYWORDS, AFFECTED_AREA_KEYWORDS: Keyword patterns for LLM-free classification.
 - GEMINI_KEY: API key for Gemini integration (keep secure).
 
 Usage:
     Import and reference these constants throughout the application to enforce policy and configuration.
 """
 
+import os
+
 # ---------------------------
 # Confidence & Decision Policy
 # ---------------------------
@@ -37,6 +62,9 @@ SUCCESS_WEIGHT = 0.4
 NO_EVIDENCE_CONFIDENCE = 0.3
 ERROR_CONFIDENCE = 0.0
 
+# Seconds to wait for a human decision before escalating (treated as rejection)
+HUMAN_APPROVAL_TIMEOUT_SECONDS = 300
+
 
 # ---------------------------
 # Database / Evidence Policy
@@ -45,34 +73,154 @@ ERROR_CONFIDENCE = 0.0
 # Max vector distance allowed to even consider similarity
 MAX_VECTOR_DISTANCE = 0.6
 
+# Nearest playbooks fetched per search (approximate, index-backed)
+EVIDENCE_TOP_K = 8
+
+# Connection pool sizing for the evidence agent
+DB_POOL_MIN = 2
+DB_POOL_MAX = 10
+DB_POOL_INCREMENT = 1
+
+# Per-connection statement cache: repeated SQL skips the parse step
+DB_STMT_CACHE_SIZE = 20
+
+
+# ---------------------------
+# Embeddings
+# ---------------------------
+
+# Number of distinct texts whose embeddings are kept in memory
+EMBEDDING_CACHE_SIZE = 4096
+
+# Texts per forward pass for batched embedding
+EMBEDDING_BATCH_SIZE = 32
+
+# "auto" (int8 ONNX if exported, else CUDA > MPS > CPU), or "cuda" / "mps" / "cpu".
+# Override with the EMBEDDING_DEVICE environment variable, e.g. to pin CPU
+# for reproducible vectors.
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "auto")
+
+# Output directory of export_embedding_model.py (int8 ONNX model + tokenizer)
+EMBEDDING_ONNX_DIR = "minilm-onnx-int8"
+
+
+# ---------------------------
+# LLM Response Cache
+# ---------------------------
+
+# Reuse prior Gemini completions for identical prompts
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = ".llm_cache.db"
+
+
+# ---------------------------
+# Request Memo
+# ---------------------------
+
+# Distinct incident descriptions whose agent results are kept in memory
+REQUEST_MEMO_SIZE = 1024
+
 
 # ---------------------------
 # Observability
 # ---------------------------
 
 SERVICE_NAME = "incident-decision-agent"
+SERVICE_VERSION = "1.0.0"
+DEPLOYMENT_ENVIRONMENT = os.getenv("DEPLOYMENT_ENVIRONMENT", "demo")
+
+# Set TRACING_ENABLED=false to skip installing the SDK tracer provider
+# (spans then go to the no-op API tracer)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() not in ("0", "false", "no")
+
+# Head-based sampling ratio for new traces (child spans follow their parent).
+# 1.0 keeps every trace for the demo; production would use e.g. 0.05.
+TRACE_SAMPLE_RATIO = float(os.getenv("TRACE_SAMPLE_RATIO", "1.0"))
+
+# Span batching (BatchSpanProcessor). Standard OTEL_BSP_* environment
+# variables override these defaults.
+OTEL_BSP_MAX_QUEUE_SIZE = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "4096"))
+# Keeps each export request well under the 4 MB gRPC message limit
+OTEL_BSP_MAX_EXPORT_BATCH_SIZE = int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "256"))
+OTEL_BSP_SCHEDULE_DELAY = int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "1000"))        # ms
+OTEL_BSP_EXPORT_TIMEOUT = int(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", "10000"))       # ms
+
+# Parallel exporter workers (each with its own batch processor, gRPC channel
+# and thread). Defaults to 1: each trace goes to a single worker and a CLI run
+# produces one trace, so extra workers would only add startup/shutdown cost.
+# Raise it for long-running processes with many concurrent traces.
+OTEL_EXPORT_WORKERS = int(os.getenv("OTEL_EXPORT_WORKERS", "1"))
+
+# OTLP export compression: "gzip", "deflate" or "none"
+OTLP_COMPRESSION = os.getenv("OTEL_EXPORTER_OTLP_COMPRESSION", "gzip").lower()
+
+# Per-span limits: extra attributes/events are dropped, longer string values
+# (stack traces, SQL, decision text) are truncated
+SPAN_MAX_ATTRIBUTES = 64
+SPAN_MAX_EVENTS = 32
+SPAN_ATTRIBUTE_MAX_LENGTH = 1024
+
+# Pipelined export over grpc.aio (opt-in): a batch processor keeps up to
+# OTLP_MAX_IN_FLIGHT Export() calls outstanding instead of waiting on each
+OTLP_ASYNC_EXPORT = os.getenv("OTLP_ASYNC_EXPORT", "false").lower() in ("1", "true", "yes")
+OTLP_MAX_IN_FLIGHT = 4
+
+# Tail sampling (opt-in): buffer each trace until its root ends and export it
+# only if a span errored, exceeded the latency threshold, or set a keep flag
+TAIL_SAMPLING_ENABLED = os.getenv("TAIL_SAMPLING_ENABLED", "false").lower() in ("1", "true", "yes")
+TAIL_SAMPLING_LATENCY_MS = 5000
+TAIL_SAMPLING_KEEP_ATTRIBUTES = (
+    "human.review",
+    "decision.requires_human",
+    "incident.ambiguous",
+    "human.timed_out",
+)
+TAIL_SAMPLING_MAX_TRACES = 1000
 
 # ---------------------------
 # Incident Normalization
 # ---------------------------
 
-INCIDENT_TYPES = [
+# Ordered values (used to render prompts deterministically)
+INCIDENT_TYPE_CHOICES = (
     "service_outage",
     "service_degradation",
     "configuration_error",
     "deployment_issue",
     "unknown_but_classified"
-]
+)
 
-AFFECTED_AREAS = [
+AFFECTED_AREA_CHOICES = (
     "payments",
     "login",
     "orders",
     "delivery",
     "general"
-]
+)
+
+# Sets for O(1) membership validation
+INCIDENT_TYPES = frozenset(INCIDENT_TYPE_CHOICES)
+AFFECTED_AREAS = frozenset(AFFECTED_AREA_CHOICES)
+
+# Keyword fast path: regex fragments (case-insensitive, matched at a word
+# start). The LLM is skipped only when exactly one type and exactly one
+# area match the description.
+INCIDENT_TYPE_KEYWORDS = {
+    "service_outage": r"outage|down\b|unavailable|not (?:working|loading)",
+    "service_degradation": r"slow|latenc|degrad|timeout|timing out",
+    "configuration_error": r"config|misconfig|setting",
+    "deployment_issue": r"deploy|release|rollout|upgrade",
+}
+
+AFFECTED_AREA_KEYWORDS = {
+    "payments": r"payment|checkout|billing",
+    "login": r"log ?in|sign ?in|authenticat",
+    "orders": r"order",
+    "delivery": r"deliver|shipping|shipment",
+}
 
 GEMINI_KEY=""
 DB_HOST=""
 DB_PASSWORD=""
-JAEGER_ENDPOINT=""
+# Local collector sidecar (otel-collector-config.yaml); it forwards to Jaeger
+JAEGER_ENDPOINT=os.getenv("JAEGER_ENDPOINT", "http://127.0.0.1:4317")
@@ -0,0 +1,39 @@
+"""
+This script exports the 'all-MiniLM-L6-v2' sentence transformer to ONNX and quantizes it to int8 for fast CPU inference.
+
+Workflow:
+1. Exports the Hugging Face model to ONNX using Optimum (feature-extraction task).
+2. Applies dynamic int8 quantization tuned for AVX-512 VNNI CPUs.
+3. Saves the quantized model and its tokenizer to EMBEDDING_ONNX_DIR.
+4. Prints the output location upon completion.
+
+Once the quantized model exists, agents.embedding_utils uses ONNX Runtime instead of PyTorch automatically.
+
+Requirements:
+    - optimum[onnxruntime] and onnxruntime Python packages (not in requirements.txt):
+      pip install -r requirements-onnx.txt
+    - transformers Python package
+
+Usage:
+    python export_embedding_model.py
+"""
+
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+from config.settings import EMBEDDING_ONNX_DIR
+
+HF_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
+model = ORTModelForFeatureExtraction.from_pretrained(HF_MODEL_ID, export=True)
+tokenizer = AutoTokenizer.from_pretrained(HF_MODEL_ID)
+
+# Dynamic quantization: weights int8, activations quantized at runtime
+quantizer = ORTQuantizer.from_pretrained(model)
+qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+
+quantizer.quantize(save_dir=EMBEDDING_ONNX_DIR, quantization_config=qconfig)
+tokenizer.save_pretrained(EMBEDDING_ONNX_DIR)
+
+print(f"Quantized embedding model saved to {EMBEDDING_ONNX_DIR}.")
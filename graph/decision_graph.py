@@ -8,14 +8,15 @@ Functions:
 Workflow Nodes:
 - interpreter: Processes the initial user input and interprets the incident description.
 - oracle_evidence: Gathers evidence from Oracle data sources.
-- knowledge: Retrieves additional knowledge or context.
-- orchestrator: Makes decisions based on gathered evidence and knowledge.
+- knowledge: Retrieves additional knowledge or context for the human reviewer.
+- orchestrator: Makes decisions based on gathered evidence.
 - human_approval: Handles cases where human intervention is required.
 
 Graph Flow:
 1. Entry point is the interpreter node.
-2. Normal flow: interpreter → oracle_evidence → knowledge → orchestrator.
-3. Conditional: orchestrator routes to human_approval if needed, otherwise ends.
+2. Normal flow: interpreter → oracle_evidence → orchestrator.
+3. Conditional: orchestrator routes to knowledge → human_approval if needed, otherwise ends.
+   The orchestrator never reads knowledge_signal, so the knowledge LLM call is only paid when a reviewer will see it.
 4. The human_approval node always ends the flow.
 
 Usage:
@@ -47,18 +48,19 @@ def build_decision_graph():
 
     # ---- Normal flow ----
     graph.add_edge("interpreter", "oracle_evidence")
-    graph.add_edge("oracle_evidence", "knowledge")
-    graph.add_edge("knowledge", "orchestrator")
+    graph.add_edge("oracle_evidence", "orchestrator")
 
     # ---- Conditional governance ----
+    # Knowledge only informs the human reviewer, never the decision
     graph.add_conditional_edges(
         "orchestrator",
-        lambda state: "human_approval" if state["requires_human"] else END,
+        lambda state: "knowledge" if state["requires_human"] else END,
         {
-            "human_approval": "human_approval",
+            "knowledge": "knowledge",
             END: END,
         },
     )
+    graph.add_edge("knowledge", "human_approval")
 
     # ---- Human always ends flow ----
     graph.add_edge("human_approval", END)
@@ -0,0 +1,29 @@
+"""
+This module configures a persistent LangChain LLM response cache for the Gemini agents.
+
+Functions:
+    setup_llm_cache():
+        Installs a SQLite-backed global LLM cache so identical prompts (temperature=0) are answered without a Gemini round-trip.
+
+Details:
+- Uses LangChain's global cache hook, consulted inside both invoke and ainvoke.
+- Cache entries are keyed on the full prompt and the model parameters.
+- Disabled entirely when LLM_CACHE_ENABLED is False; LangChain is then not imported at all.
+
+Usage:
+    Call setup_llm_cache() at the start of your application, alongside setup_tracing().
+"""
+
+from config.settings import LLM_CACHE_ENABLED, LLM_CACHE_PATH
+
+
+def setup_llm_cache():
+    if not LLM_CACHE_ENABLED:
+        return
+
+    # Imported here: langchain_community is heavy and only needed when the
+    # cache is enabled
+    from langchain_community.cache import SQLiteCache
+    from langchain_core.globals import set_llm_cache
+
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
@@ -5,15 +5,15 @@ Workflow:
 1. Connects to the Oracle database using provided credentials.
 2. Declares the VECTOR bind type for the embedding column.
 3. Defines a list of playbooks, each with an issue, action, and success flag.
-4. For each playbook:
-    - Generates a vector embedding for the issue text using the embedding utility.
-    - Inserts the playbook data and embedding into the 'incident_playbooks' table.
-5. Commits the transaction and closes the database connection.
-6. Prints a success message upon completion.
+4. Generates vector embeddings for all issue texts in one batched call.
+5. Inserts all playbooks and embeddings into the 'incident_playbooks' table with a single executemany.
+6. Commits the transaction.
+7. Creates the in-memory neighbor graph vector index (if missing; warns and continues if the database cannot) and closes the database connection.
+8. Prints a success message upon completion.
 
 Requirements:
     - oracledb Python package
-    - agents.embedding_utils.generate_embedding function
+    - agents.embedding_utils.generate_embeddings function
     - Oracle database with 'incident_playbooks' table and VECTOR column
 
 Usage:
@@ -21,7 +21,7 @@ Usage:
 """
 
 import oracledb
-from agents.embedding_utils import generate_embedding
+from agents.embedding_utils import generate_embeddings
 from config.settings import DB_HOST, DB_PASSWORD
 
 conn = oracledb.connect(
@@ -44,22 +44,44 @@ playbooks = [
     {"issue": "Intermittent timeouts during peak load", "action": "Restart application servers", "success": 0},
 ]
 
-for pb in playbooks:
-    embedding = generate_embedding(pb["issue"])
+# One batched forward pass for all issue texts
+embeddings = generate_embeddings([pb["issue"] for pb in playbooks])
 
+# One round-trip for all rows
+cursor.executemany(
+    """
+    INSERT INTO incident_playbooks
+    (issue_text, action_taken, success, embedding)
+    VALUES (:issue, :action, :success, :embedding)
+    """,
+    [
+        {
+            "issue": pb["issue"],
+            "action": pb["action"],
+            "success": pb["success"],
+            "embedding": embedding,
+        }
+        for pb, embedding in zip(playbooks, embeddings)
+    ],
+)
+
+conn.commit()
+
+# Approximate nearest-neighbor index used by the evidence agent. Optional:
+# without it (e.g. VECTOR_MEMORY_SIZE not set) FETCH APPROX runs an exact
+# search, so a failure here must not abort the already-committed load.
+try:
     cursor.execute(
         """
-        INSERT INTO incident_playbooks
-        (issue_text, action_taken, success, embedding)
-        VALUES (:issue, :action, :success, :embedding)
-        """,
-        issue=pb["issue"],
-        action=pb["action"],
-        success=pb["success"],
-        embedding=embedding,
+        CREATE VECTOR INDEX IF NOT EXISTS ix_pb_emb
+        ON incident_playbooks (embedding)
+        ORGANIZATION INMEMORY NEIGHBOR GRAPH
+        DISTANCE COSINE
+        """
     )
+except oracledb.DatabaseError as e:
+    print(f"Warning: vector index not created ({e}); evidence search will use exact scans.")
 
-conn.commit()
 cursor.close()
 conn.close()
 
@@ -4,12 +4,12 @@ Main entry point for the Incident Decision Review Assistant application.
 This script initializes telemetry tracing, collects a user-provided incident description, builds the decision graph, and executes the agentic flow to analyze the incident. The final outcome, including confidence score, human approval requirement, and a response message, is printed for the user.
 
 Workflow:
-1. Sets up OpenTelemetry tracing for distributed monitoring.
+1. Sets up OpenTelemetry tracing for distributed monitoring and the LLM response cache.
 2. Prompts the user for a natural language description of their issue.
 3. Builds the decision graph using the LangGraph framework.
 4. Initializes the shared state for the agentic flow.
-5. Executes the decision process within a tracing span.
-6. Outputs the final results to the user.
+5. Executes the decision process asynchronously within a tracing span.
+6. Outputs the final results to the user and records them as a span event.
 
 Usage:
     python main.py
@@ -19,14 +19,18 @@ Requirements:
     - The supporting modules (graph, telemetry, etc.) must be present in the workspace.
 """
 
+import asyncio
+import sys
+
 from graph.decision_graph import build_decision_graph
-from telemetry import setup_tracing
-from opentelemetry import trace
+from telemetry import TRACER, setup_tracing
+from llm_cache import setup_llm_cache
+from agents.request_memo import request_key
 
 
 def main():
     setup_tracing()
-    tracer = trace.get_tracer("incident-decision-app")
+    setup_llm_cache()
 
     print("\n=== Incident Decision Review Assistant ===\n")
 
@@ -39,6 +43,7 @@ def main():
     # 🔹 Initial shared state
     initial_state = {
         "user_description": user_description,
+        "request_key": request_key(user_description),
         "incident_signature": None,
         "oracle_evidence": None,
         "knowledge_signal": None,
@@ -47,18 +52,31 @@ def main():
         "final_decision": None,
     }
 
-    # 🔹 Execute agentic flow
-    with tracer.start_as_current_span("incident_decision_flow"):
-        final_state = graph.invoke(initial_state)
-
-    # 🔹 Final outcome (customer-safe)
-    print("\n--- FINAL OUTPUT ---")
-    print(f"Issue Description     : {user_description}")
-    print(f"Confidence Score      : {final_state['confidence']}")
-    print(f"Human Approval Needed : {final_state['requires_human']}")
-    print(f"Response              : {final_state['response_message']}")
-
-    print("---------------------\n")
+    # 🔹 Execute agentic flow (async: LLM calls don't block the loop)
+    with TRACER.start_as_current_span("incident_decision_flow") as span:
+        final_state = asyncio.run(graph.ainvoke(initial_state))
+
+        span.add_event(
+            "decision_output",
+            {
+                "decision.final": final_state.get("final_decision") or "none",
+                "decision.confidence": float(final_state["confidence"] or 0.0),
+                "decision.requires_human": bool(final_state["requires_human"]),
+            },
+        )
+
+    # 🔹 Final outcome (customer-safe), one buffered write
+    sys.stdout.write("\n".join([
+        "",
+        "--- FINAL OUTPUT ---",
+        f"Issue Description     : {user_description}",
+        f"Confidence Score      : {final_state['confidence']}",
+        f"Human Approval Needed : {final_state['requires_human']}",
+        f"Response              : {final_state['response_message']}",
+        "---------------------",
+        "",
+    ]) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
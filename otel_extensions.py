@@ -0,0 +1,247 @@
+"""
+This module contains custom OpenTelemetry SDK components used by telemetry.setup_tracing().
+
+Classes:
+    ShardedSpanProcessor:
+        Distributes ended spans across several independent span processors (each with its own exporter worker),
+        so export throughput is not capped by a single BatchSpanProcessor thread.
+    AsyncOTLPSpanExporter:
+        OTLP/gRPC span exporter built on grpc.aio, so a batch processor can hand off the next batch
+        while earlier Export() calls are still waiting on the network.
+    TailSamplerProcessor:
+        Buffers the spans of each trace until its local root span ends, then forwards the whole trace
+        only if it contains an error, a slow span, or a flagged attribute (e.g. human.review).
+
+Functions:
+    install_resource_encoding_cache():
+        Memoizes the OTLP encoder's protobuf Resource conversion, so the immutable provider resource
+        is encoded once instead of on every export batch.
+
+Details:
+- Spans are routed by trace_id, so all spans of one trace go through the same worker.
+- Each span goes to exactly one delegate; registering N processors on the provider instead would export every span N times.
+- The async exporter runs its own event loop thread; at most max_in_flight exports are outstanding,
+  after which export() blocks (backpressure on the batch processor).
+- Failed async exports are logged, not retried; the local collector handles retries.
+- The resource cache patches a private encoder helper; on SDK versions without it, it does nothing.
+- The tail sampler keeps at most max_traces unfinished traces; the oldest is dropped when the buffer is full.
+  Spans that end after their local root follow the decision already made for the trace (for the last max_traces traces).
+
+Usage:
+    Built by setup_tracing(); not intended to be used directly by agents.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import grpc
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import TraceServiceStub
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import StatusCode
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedSpanProcessor(SpanProcessor):
+    def __init__(self, processors):
+        self._processors = tuple(processors)
+
+    def _shard(self, span):
+        return self._processors[span.context.trace_id % len(self._processors)]
+
+    def on_start(self, span, parent_context=None):
+        self._shard(span).on_start(span, parent_context=parent_context)
+
+    def on_end(self, span):
+        self._shard(span).on_end(span)
+
+    def shutdown(self):
+        for processor in self._processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis=30000):
+        return all(
+            processor.force_flush(timeout_millis) for processor in self._processors
+        )
+
+
+class TailSamplerProcessor(SpanProcessor):
+    def __init__(self, delegate, latency_ms, keep_attributes=(), max_traces=1000):
+        self._delegate = delegate
+        self._latency_ns = latency_ms * 1_000_000
+        self._keep_attributes = tuple(keep_attributes)
+        self._max_traces = max_traces
+
+        # trace_id -> [ended spans, keep flag], oldest trace first
+        self._traces = OrderedDict()
+        # trace_id -> keep flag of recently completed traces, so spans that
+        # end after their local root follow the trace's decision
+        self._decided = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _keep(self, span):
+        if span.status.status_code is StatusCode.ERROR:
+            return True
+        if span.end_time - span.start_time > self._latency_ns:
+            return True
+        attributes = span.attributes or {}
+        return any(attributes.get(key) for key in self._keep_attributes)
+
+    def on_start(self, span, parent_context=None):
+        self._delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span):
+        trace_id = span.context.trace_id
+        local_root = span.parent is None or span.parent.is_remote
+
+        with self._lock:
+            decided = self._decided.get(trace_id)
+
+            if decided is None:
+                entry = self._traces.get(trace_id)
+                if entry is None:
+                    entry = self._traces[trace_id] = [[], False]
+
+                entry[0].append(span)
+                entry[1] = entry[1] or self._keep(span)
+
+                if not local_root:
+                    while len(self._traces) > self._max_traces:
+                        self._traces.popitem(last=False)
+                    return
+
+                del self._traces[trace_id]
+                self._decided[trace_id] = entry[1]
+                while len(self._decided) > self._max_traces:
+                    self._decided.popitem(last=False)
+
+        # Late span of an already completed trace: same decision
+        if decided is not None:
+            if decided:
+                self._delegate.on_end(span)
+            return
+
+        # Trace complete: forward it whole, or drop it
+        if entry[1]:
+            for ended in entry[0]:
+                self._delegate.on_end(ended)
+
+    def shutdown(self):
+        # Unfinished traces have no root yet and are discarded
+        with self._lock:
+            self._traces.clear()
+            self._decided.clear()
+        self._delegate.shutdown()
+
+    def force_flush(self, timeout_millis=30000):
+        return self._delegate.force_flush(timeout_millis)
+
+
+class AsyncOTLPSpanExporter(SpanExporter):
+    def __init__(self, endpoint, channel_options=(), compression=None,
+                 timeout=10.0, max_in_flight=4):
+        self._timeout = timeout
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._shutdown = False
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="otlp-async-export", daemon=True
+        )
+        self._thread.start()
+
+        # "http://host:4317" -> "host:4317"
+        target = urlparse(endpoint).netloc or endpoint
+        self._channel, self._stub = self._run(
+            self._connect(target, channel_options, compression)
+        ).result()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _connect(self, target, options, compression):
+        # aio channels must be created on the loop that uses them
+        channel = grpc.aio.insecure_channel(
+            target, options=list(options), compression=compression
+        )
+        return channel, TraceServiceStub(channel)
+
+    async def _send(self, request):
+        try:
+            await self._stub.Export(request, timeout=self._timeout)
+        except grpc.RpcError as e:
+            logger.warning("OTLP span export failed: %s", e.code())
+
+    def _done(self, future):
+        with self._pending_lock:
+            self._pending.discard(future)
+        self._in_flight.release()
+
+    def export(self, spans):
+        if self._shutdown:
+            return SpanExportResult.FAILURE
+
+        # Encode on the caller's thread; only the network wait is async
+        request = encode_spans(spans)
+
+        self._in_flight.acquire()
+        future = self._run(self._send(request))
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis=30000):
+        with self._pending_lock:
+            pending = list(self._pending)
+
+        _, not_done = concurrent.futures.wait(pending, timeout=timeout_millis / 1000)
+        return not not_done
+
+    def shutdown(self):
+        if self._shutdown:
+            return
+        self._shutdown = True
+
+        self.force_flush(self._timeout * 1000)
+        try:
+            self._run(self._channel.close()).result(self._timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(self._timeout)
+
+
+def install_resource_encoding_cache():
+    try:
+        from opentelemetry.exporter.otlp.proto.common._internal import trace_encoder
+    except ImportError:
+        return False
+
+    encode = getattr(trace_encoder, "_encode_resource", None)
+    if encode is None:
+        return False
+    if getattr(encode, "_cached", False):
+        return True
+
+    # One provider → one resource; remember the last one and its message.
+    # Safe to share: ResourceSpans(resource=...) copies the message.
+    last = [None, None]
+
+    def cached_encode_resource(resource):
+        if last[0] is not resource:
+            last[1] = encode(resource)
+            last[0] = resource
+        return last[1]
+
+    cached_encode_resource._cached = True
+    trace_encoder._encode_resource = cached_encode_resource
+    return True
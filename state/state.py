@@ -9,9 +9,11 @@ Classes:
 
 Fields:
 - user_description: The user's description of the issue.
+- request_key: Hash of the normalized description, used to reuse agent results for repeated requests.
 - incident_signature: Signature or metadata for the incident.
 - oracle_evidence: Evidence details from Oracle (see OracleEvidence).
 - evidence_status: Status of evidence retrieval ("FOUND", "NOT_FOUND", or "ERROR").
+- knowledge_signal: Contextual knowledge from the knowledge agent (known cause, suggested fix, confidence hint).
 - confidence: Confidence score for the automated decision.
 - requires_human: Whether human approval is needed.
 - final_decision: The final decision or action taken.
@@ -21,7 +23,7 @@ Usage:
     Import these types to annotate and manage state in the incident decision agent workflow.
 """
 
-from typing import TypedDict, Optional, Dict, Literal
+from typing import TypedDict, Optional, Dict, Literal, Any
 
 
 class OracleEvidence(TypedDict):
@@ -33,6 +35,7 @@ class OracleEvidence(TypedDict):
 
 class IncidentState(TypedDict):
     user_description: Optional[str]
+    request_key: Optional[str]          # hash of normalized description
     incident_signature: Optional[Dict[str, str]]
 
     # Evidence
@@ -41,6 +44,9 @@ class IncidentState(TypedDict):
     # 🔹 NEW: evidence health
     evidence_status: Literal["FOUND", "NOT_FOUND", "ERROR"]
 
+    # Contextual knowledge (LLM-derived, never decisive)
+    knowledge_signal: Optional[Dict[str, Any]]
+
     # Decision
     confidence: Optional[float]
     requires_human: Optional[bool]
@@ -3,38 +3,227 @@ This module configures OpenTelemetry tracing for the incident decision agent ser
 
 Functions:
     setup_tracing():
-        Sets up the OpenTelemetry tracer provider with a resource name, configures an OTLP exporter to send traces to a specified endpoint, and attaches a batch span processor to the provider.
+        Sets up the OpenTelemetry tracer provider with a resource name, configures OTLP exporters to send traces to a specified endpoint, and attaches batch span processors to the provider.
+    db_span(name, links=None):
+        Starts a database span as a new trace root linked to the caller's span (or the given span contexts)
+        instead of as its child.
 
 Details:
 - Uses OpenTelemetry SDK for Python.
 - Exports traces to an OTLP-compatible backend via gRPC.
-- The service is identified as 'incident-decision-agent'.
-- The OTLP endpoint is set to 'http://54.174.185.20:4317' with insecure (non-TLS) communication.
+- The service is identified as 'incident-decision-agent', with service.version, deployment.environment, and process attributes on the resource.
+- Spans go to JAEGER_ENDPOINT (default: a local OpenTelemetry Collector at 'http://127.0.0.1:4317') over insecure (non-TLS) gRPC;
+  the collector forwards them to the remote Jaeger (see otel-collector-config.yaml).
+- The gRPC channel is reused between batches; keepalive pings only run while an export is in flight.
+- Export payloads are compressed per OTLP_COMPRESSION (gzip by default).
+- Span size is capped with SDK SpanLimits (SPAN_MAX_ATTRIBUTES, SPAN_MAX_EVENTS, SPAN_ATTRIBUTE_MAX_LENGTH).
+- Safe to call more than once: only the first call installs a provider.
+- The composed processor is the provider's active span processor; provider.add_span_processor() is not supported afterwards.
+- Imports the OpenTelemetry SDK, exporter and gRPC only inside setup_tracing().
+- Does nothing when TRACING_ENABLED is False; otherwise samples new traces at TRACE_SAMPLE_RATIO (parent-based).
+- Span batching (queue size, batch size, delay, export timeout) comes from config.settings (OTEL_BSP_*).
+- OTEL_EXPORT_WORKERS > 1 runs that many exporter/batch-processor pairs behind a ShardedSpanProcessor,
+  splitting the queue size between them.
+- TAIL_SAMPLING_ENABLED keeps only traces with an error, a span slower than TAIL_SAMPLING_LATENCY_MS,
+  or a TAIL_SAMPLING_KEEP_ATTRIBUTES flag set (TailSamplerProcessor).
+- The provider resource is encoded to protobuf once, not per export batch (install_resource_encoding_cache()).
+- OTLP_ASYNC_EXPORT switches to AsyncOTLPSpanExporter (grpc.aio), keeping up to OTLP_MAX_IN_FLIGHT exports outstanding.
+
+Attributes:
+    TRACER:
+        Application tracer (service name and version); import it instead of calling trace.get_tracer() per use.
 
 Usage:
-    Call setup_tracing() at the start of your application to enable distributed tracing.
+    Call setup_tracing() at the start of your application to enable distributed tracing,
+    then start spans with TRACER.start_as_current_span(...).
 """
 
+# Only the lightweight API is imported here; the SDK, exporters and gRPC are
+# imported in setup_tracing(), so processes that never enable tracing skip
+# their import time and memory.
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import Resource
-from config.settings import JAEGER_ENDPOINT
+from opentelemetry.context import Context
+from config.settings import (
+    SERVICE_NAME,
+    SERVICE_VERSION,
+    DEPLOYMENT_ENVIRONMENT,
+    TRACING_ENABLED,
+    TRACE_SAMPLE_RATIO,
+    JAEGER_ENDPOINT,
+    OTEL_BSP_MAX_QUEUE_SIZE,
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+    OTEL_BSP_SCHEDULE_DELAY,
+    OTEL_BSP_EXPORT_TIMEOUT,
+    OTEL_EXPORT_WORKERS,
+    OTLP_COMPRESSION,
+    SPAN_MAX_ATTRIBUTES,
+    SPAN_MAX_EVENTS,
+    SPAN_ATTRIBUTE_MAX_LENGTH,
+    OTLP_ASYNC_EXPORT,
+    OTLP_MAX_IN_FLIGHT,
+    TAIL_SAMPLING_ENABLED,
+    TAIL_SAMPLING_LATENCY_MS,
+    TAIL_SAMPLING_KEEP_ATTRIBUTES,
+    TAIL_SAMPLING_MAX_TRACES
+)
 
-def setup_tracing():
-    resource = Resource.create({
-        "service.name": "incident-decision-agent"
-    })
+# Reuse one HTTP/2 connection across export batches instead of
+# re-establishing it. Keepalive pings are sent only while an Export is in
+# flight (permit_without_calls=0): on default server policy, pings on an
+# idle connection are answered with GOAWAY too_many_pings however slow
+# they are. Batches up to 8 MB are allowed; the collector receiver is
+# configured to accept them (max_recv_msg_size_mib in
+# otel-collector-config.yaml).
+_CHANNEL_OPTIONS = (
+    ("grpc.keepalive_time_ms", 300000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 0),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_send_message_length", 8 * 1024 * 1024),
+)
+
+
+# Span batches are repetitive (attribute keys, ids) and compress well;
+# values are grpc.Compression member names
+_COMPRESSION = {
+    "gzip": "Gzip",
+    "deflate": "Deflate",
+    "none": "NoCompression",
+}
+
+
+def _build_exporter():
+    import grpc
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+    # Each exporter owns its gRPC channel
+    compression = getattr(grpc.Compression, _COMPRESSION.get(OTLP_COMPRESSION, "Gzip"))
 
-    provider = TracerProvider(resource=resource)
+    if OTLP_ASYNC_EXPORT:
+        from otel_extensions import AsyncOTLPSpanExporter
 
-    exporter = OTLPSpanExporter(
+        return AsyncOTLPSpanExporter(
+            endpoint=JAEGER_ENDPOINT,
+            channel_options=_CHANNEL_OPTIONS,
+            compression=compression,
+            timeout=OTEL_BSP_EXPORT_TIMEOUT / 1000,
+            max_in_flight=OTLP_MAX_IN_FLIGHT,
+        )
+
+    return OTLPSpanExporter(
         endpoint=JAEGER_ENDPOINT,
         insecure=True,
+        channel_options=_CHANNEL_OPTIONS,
+        compression=compression,
+    )
+
+
+# Provider installed by setup_tracing(); guards against repeat calls
+_provider = None
+
+# Shared application tracer, created once. Bound at import so
+# `from telemetry import TRACER` works anywhere; it is a proxy that starts
+# delegating to the real provider as soon as setup_tracing() installs it.
+TRACER = trace.get_tracer(SERVICE_NAME, SERVICE_VERSION)
+
+
+def setup_tracing():
+    global _provider
+
+    # Idempotent: a second call (reload, tests) must not start another
+    # exporter thread or queue
+    if _provider is not None or not TRACING_ENABLED:
+        return
+
+    from opentelemetry.sdk.trace import SpanLimits, TracerProvider
+    from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.resources import Resource, ProcessResourceDetector
+
+    # Resource attributes are set once on the provider and shared by every
+    # span. Resource.create() also applies OTEL_RESOURCE_ATTRIBUTES and the
+    # telemetry.sdk.* attributes; the process detector adds pid/runtime.
+    resource = Resource.create({
+        "service.name": SERVICE_NAME,
+        "service.version": SERVICE_VERSION,
+        "deployment.environment": DEPLOYMENT_ENVIRONMENT,
+    }).merge(ProcessResourceDetector().detect())
+
+    # One exporter + BatchSpanProcessor per worker; spans are sharded by
+    # trace so each is exported exactly once
+    workers = max(1, OTEL_EXPORT_WORKERS)
+    queue_size = max(1, OTEL_BSP_MAX_QUEUE_SIZE // workers)
+
+    processors = [
+        BatchSpanProcessor(
+            _build_exporter(),
+            max_queue_size=queue_size,
+            max_export_batch_size=min(OTEL_BSP_MAX_EXPORT_BATCH_SIZE, queue_size),
+            schedule_delay_millis=OTEL_BSP_SCHEDULE_DELAY,
+            export_timeout_millis=OTEL_BSP_EXPORT_TIMEOUT,
+        )
+        for _ in range(workers)
+    ]
+
+    if workers == 1:
+        processor = processors[0]
+    else:
+        from otel_extensions import ShardedSpanProcessor
+
+        processor = ShardedSpanProcessor(processors)
+
+    # Tail sampling: only errored, slow, or flagged traces reach the export
+    # queue; the rest are dropped once their root span ends
+    if TAIL_SAMPLING_ENABLED:
+        from otel_extensions import TailSamplerProcessor
+
+        processor = TailSamplerProcessor(
+            processor,
+            latency_ms=TAIL_SAMPLING_LATENCY_MS,
+            keep_attributes=TAIL_SAMPLING_KEEP_ATTRIBUTES,
+            max_traces=TAIL_SAMPLING_MAX_TRACES,
+        )
+
+    # Unsampled traces get non-recording spans: no attribute storage,
+    # no export, less GC on the hot path. Span limits are enforced as
+    # attributes/events are recorded, so oversized values (stack traces,
+    # decision text) are truncated before they are stored or serialized.
+    # The single composed processor is installed as the provider's active
+    # processor: span start/end call it directly instead of going through
+    # the default multi-processor's per-span loop.
+    provider = TracerProvider(
+        resource=resource,
+        sampler=ParentBasedTraceIdRatio(TRACE_SAMPLE_RATIO),
+        span_limits=SpanLimits(
+            max_span_attributes=SPAN_MAX_ATTRIBUTES,
+            max_events=SPAN_MAX_EVENTS,
+            max_attribute_length=SPAN_ATTRIBUTE_MAX_LENGTH,
+        ),
+        active_span_processor=processor,
     )
 
-    processor = BatchSpanProcessor(exporter)
-    provider.add_span_processor(processor)
+    # The resource never changes after this point; encode it once
+    from otel_extensions import install_resource_encoding_cache
+
+    install_resource_encoding_cache()
 
+    # The SDK provider flushes and shuts down its processors at exit
+    # (shutdown_on_exit=True), so short CLI runs don't lose queued spans
     trace.set_tracer_provider(provider)
+    _provider = provider
+
+
+def db_span(name, links=None):
+    # A linked root instead of a child: the DB span is its own trace and is
+    # batched/exported independently of the request that triggered it.
+    # Defaults to linking the currently active span.
+    if links is None:
+        current = trace.get_current_span().get_span_context()
+        links = [current] if current.is_valid else []
+
+    return TRACER.start_as_current_span(
+        name,
+        context=Context(),
+        kind=trace.SpanKind.CLIENT,
+        links=[trace.Link(span_context) for span_context in links],
+    )
@@ -2,11 +2,12 @@
 This script tests connectivity to an Oracle database using the oracledb Python package.
 
 Steps performed:
-1. Establishes a connection to the Oracle database with the provided credentials and connection details.
-2. Prints a success message upon successful connection.
-3. Executes a simple SQL query to retrieve the current database time (SYSDATE).
-4. Prints the result of the query.
-5. Closes the cursor and the database connection.
+1. Creates a session pool for the Oracle database with the provided credentials and connection details,
+   and warms it by opening its minimum number of connections up front.
+2. Acquires a pooled connection (read-only session, autocommit), prints a success message, and verifies the driver runs in Thin mode.
+3. Executes a simple SQL query to retrieve the current database time (SYSDATE) via db_time(), using the statement cache and a single round-trip.
+4. Prints the result of the query. The query runs in a db_span() linked to the test's span (traced when tracing is enabled).
+5. Releases the connection to the pool and closes the pool.
 
 Usage:
     python test_oracle_connection.py
@@ -14,27 +15,82 @@ Usage:
 Requirements:
     - oracledb Python package must be installed.
     - Network access to the Oracle database instance.
+    - No Oracle Instant Client: the driver runs in Thin mode.
 """
 
-import oracledb
-from config.settings import DB_HOST, DB_PASSWORD
+from telemetry import TRACER, db_span, setup_tracing
+from config.settings import DB_HOST, DB_PASSWORD, DB_STMT_CACHE_SIZE
 
-# Establish connection to the Oracle database
-connection = oracledb.connect(
-    user="system",
-    password=DB_PASSWORD,
-    host= DB_HOST,
-    port=1521,
-    service_name="FREEPDB1"
-)
 
-print("Connected to Oracle successfully!")
+def db_time(conn):
+    """Returns the database SYSDATE; the statement is parsed once per session."""
+    with conn.cursor() as cursor:
+        # Single row: return it with the execute response (one round-trip)
+        cursor.prefetchrows = 2
+        cursor.arraysize = 1
+        cursor.execute("SELECT sysdate FROM dual")
+        return cursor.fetchone()[0]
 
-# Create a cursor and execute a test query
-cursor = connection.cursor()
-cursor.execute("SELECT sysdate FROM dual")
-print("DB Time:", cursor.fetchone())
 
-# Clean up resources
-cursor.close()
-connection.close()
+def init_session(connection, requested_tag):
+    """Session callback: runs once per new pooled session, not per acquire."""
+    # Probe sessions never write (Oracle 23ai read-only session parameter);
+    # use READ_ONLY = FALSE before any real writes on such a session
+    with connection.cursor() as cursor:
+        cursor.execute("ALTER SESSION SET READ_ONLY = TRUE")
+
+
+def main():
+    setup_tracing()
+
+    # Imported here so importing this module (e.g. for db_time) does not
+    # load the driver or touch the database
+    import oracledb
+
+    # Thin mode (pure Python protocol): oracledb.init_oracle_client() is
+    # deliberately never called, so no Oracle Client libraries are loaded.
+
+    # Create a small session pool (the same path the evidence agent uses)
+    pool = oracledb.create_pool(
+        user="system",
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        port=1521,
+        service_name="FREEPDB1",
+        min=2,
+        max=4,
+        increment=1,
+        getmode=oracledb.POOL_GETMODE_WAIT,
+        stmtcachesize=DB_STMT_CACHE_SIZE,
+        session_callback=init_session
+    )
+
+    # Warm-up: hold pool.min connections at once so all of them are opened
+    # now (Thin mode fills the pool in the background) instead of on the
+    # first real acquire. Closing a pooled connection returns it to the pool.
+    warm = [pool.acquire() for _ in range(pool.min)]
+    for conn in warm:
+        conn.close()
+    print(f"Pool warmed: {pool.opened} connections open")
+
+    # Acquire a pooled connection and execute a test query
+    with TRACER.start_as_current_span("oracle_connection_test"), pool.acquire() as connection:
+        # Nothing to commit: no transaction bookkeeping for the probe
+        connection.autocommit = True
+        print("Connected to Oracle successfully!")
+
+        if not oracledb.is_thin_mode():
+            raise RuntimeError("Expected python-oracledb Thin mode; init_oracle_client() was called")
+        print("Driver mode: thin")
+
+        # Linked to oracle_connection_test, not a child of it
+        with db_span("oracle_db_time") as span:
+            span.set_attribute("db.system", "oracle")
+            span.set_attribute("db.operation", "SELECT sysdate FROM dual")
+            print("DB Time:", db_time(connection))
+
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()